@@ -1,23 +1,45 @@
 import asyncio
 import aiohttp
 import orjson
-import base58
-import random
+import based58
+import base64
+import itertools
+import struct
+import os
+import sys
 import concurrent.futures
-from solders.transaction import Transaction
+import contextlib
+import multiprocessing
+from collections import Counter, deque
 from solders.system_program import TransferParams, transfer
 from solders.keypair import Keypair
 from solders.message import Message
 from solders.hash import Hash
+from solders.transaction import Transaction
+from nacl.bindings import crypto_sign, crypto_sign_seed_keypair
+
+try:
+    import uvloop  # Faster event loop; not available on Windows
+except ImportError:
+    uvloop = None
 
 
 # ========================================
 # Configuration
 # ========================================
-LAMPORTS = 1                   # Minimum lamports per transaction
+LAMPORTS = 1                   # Minimum lamports per transaction (raised per tx to keep them distinct)
 NUM_SENDERS = 150              # Number of concurrent sender tasks
 QUEUE_MAXSIZE = 3000           # Maximum number of signed transactions in-flight
 MEASUREMENT_INTERVAL = 5       # Print stats every N seconds
+# Worker processes, one per core this process may run on (minus one for the
+# main process); affinity also honours CPU limits set by containers
+if hasattr(os, "sched_getaffinity"):
+    NUM_WORKERS = max(1, len(os.sched_getaffinity(0)) - 1)
+else:
+    NUM_WORKERS = max(1, (os.cpu_count() or 1) - 1)
+NUM_WORKERS = min(NUM_WORKERS, NUM_SENDERS)  # Every worker needs at least one sender
+SIGN_BATCH_SIZE = 32           # Transactions signed per executor submission
+SEND_BATCH_SIZE = 16           # Transactions per JSON-RPC batch request
 
 # If you have multiple RPCs, list them here:
 SOLANA_RPC_URLS = [
@@ -31,205 +53,464 @@ ACCOUNT_PRIVATE = ""
 
 # Validate private key
 try:
-    keypair = Keypair.from_bytes(base58.b58decode(ACCOUNT_PRIVATE))
+    keypair = Keypair.from_bytes(based58.b58decode(ACCOUNT_PRIVATE.encode("ascii")))
 except Exception as e:
     raise ValueError(f"Invalid ACCOUNT_PRIVATE provided: {e}")
 
 # ========================================
 # Global shared state
 # ========================================
-total_success = 0
-error_count = 0
-current_blockhash = None
-tx_queue = asyncio.Queue(maxsize=QUEUE_MAXSIZE)
-
-# Prepare a dedicated executor for CPU-bound transaction signing
-executor = concurrent.futures.ThreadPoolExecutor(max_workers=NUM_SENDERS * 2)
-
-# Prebuild one transfer instruction (from self -> self)
-transfer_inst = transfer(
-    TransferParams(
-        from_pubkey=keypair.pubkey(),
-        to_pubkey=keypair.pubkey(),
-        lamports=LAMPORTS
+# Each worker process owns one shared unsigned array, updated in place by
+# index; the parent process sums them for the stats line
+SUCCESS, ERRORS, QUEUED = 0, 1, 2
+counters = None  # Set in each worker process by run_worker()
+# The main process polls the blockhash and publishes it as raw 32 bytes in
+# `shared_blockhash`; each worker copies it into `current_blockhash`
+NO_BLOCKHASH = bytes(32)
+shared_blockhash = None        # Set by main() and run_worker()
+latest_valid_height = 0        # Main process: lastValidBlockHeight of the published hash
+current_blockhash = None       # Worker: blockhash producers sign with
+tx_deque = deque()  # Signed transactions waiting to be sent
+# Created in main_worker() so they bind to the running event loop
+tx_ready = None     # Set whenever a transaction is appended to tx_deque
+tx_slots = None     # Free queue slots (this worker's share of QUEUE_MAXSIZE)
+blockhash_ready = None  # Set once the first blockhash has been fetched
+
+# Round-robin rotation over the RPCs for blockhash polling
+rpc_cycle = itertools.cycle(SOLANA_RPC_URLS)
+
+# Shared request headers; Content-Type is required by the RPC, and
+# keep-alive lets every request reuse a pooled connection
+JSON_HEADERS = {"Content-Type": "application/json", "Connection": "keep-alive"}
+
+# Prebuilt JSON-RPC payloads: only the encoded transaction changes per request.
+# Entries of a batch request get distinct ids, so there is one suffix per slot.
+SEND_TX_PREFIX = b'{"jsonrpc":"2.0","method":"sendTransaction","params":["'
+SEND_TX_SUFFIXES = [
+    b'",{"encoding":"base64"}],"id":%d}' % i for i in range(SEND_BATCH_SIZE)
+]
+BLOCKHASH_PAYLOAD = orjson.dumps({
+    "jsonrpc": "2.0",
+    "id": 1,
+    "method": "getLatestBlockhash",
+    "params": []
+})
+
+# Per-process signing state, populated by init_signer() in each worker.
+# The unsigned message is serialized once; only the 32-byte blockhash
+# between `msg_prefix` and `msg_suffix`, and the u64 lamports amount that
+# ends the message, change from one transaction to the next.
+secret_key = None  # 64-byte libsodium secret key
+msg_prefix = None
+msg_suffix = None
+pack_lamports = struct.Struct("<Q").pack
+
+def init_signer():
+    """
+    Load the keypair's seed into libsodium and serialize the unsigned
+    transfer message (from self -> self) once per worker process.
+    """
+    global secret_key, msg_prefix, msg_suffix
+    _, secret_key = crypto_sign_seed_keypair(keypair.secret())
+    transfer_inst = transfer(
+        TransferParams(
+            from_pubkey=keypair.pubkey(),
+            to_pubkey=keypair.pubkey(),
+            lamports=LAMPORTS
+        )
     )
-)
+    msg = Message.new_with_blockhash([transfer_inst], keypair.pubkey(), Hash.default())
+    msg_bytes = bytes(msg)
 
-def create_signed_transaction(blockhash: Hash) -> str:
+    # Legacy message layout: 3-byte header, 1-byte account count (< 128 keys),
+    # 32 bytes per account key, then the recent blockhash
+    offset = 4 + 32 * len(msg.account_keys)
+    msg_prefix = msg_bytes[:offset]
+    # The transfer instruction's data ends with the u64 lamports amount
+    msg_suffix = msg_bytes[offset + 32:-8]
+
+    # Check the hand-built wire format against solders for a sample blockhash
+    sample_hash = Hash(bytes(range(32)))
+    sample_msg = msg_prefix + bytes(sample_hash) + msg_suffix + pack_lamports(LAMPORTS)
+    expected_tx = Transaction(
+        [keypair],
+        Message.new_with_blockhash([transfer_inst], keypair.pubkey(), sample_hash),
+        sample_hash
+    )
+    if (Message.from_bytes(sample_msg).recent_blockhash != sample_hash
+            or b"\x01" + crypto_sign(sample_msg, secret_key) != bytes(expected_tx)):
+        raise ValueError("Prebuilt transaction template does not match solders serialization")
+
+def create_signed_batch(blockhash_bytes: bytes, first_lamports: int, n: int) -> list:
     """
-    Create & sign a single transaction, then return base58-encoded bytes.
+    Create & sign `n` transactions in one go, amortizing the executor
+    round-trip, and return them as base64-encoded bytes.
+    Transaction k transfers `first_lamports + k * NUM_WORKERS` lamports, so
+    no two transactions signed by any worker for a blockhash are identical
+    (ed25519 is deterministic, and the validator deduplicates by signature).
+    Each result is ASCII bytes, ready to be spliced into SEND_TX_PREFIX/SUFFIXES.
+    Runs on the worker's signing thread; libsodium releases the GIL while signing.
     """
-    # Build message
-    msg = Message.new_with_blockhash([transfer_inst], keypair.pubkey(), blockhash)
-    tx = Transaction([keypair], msg, blockhash)
-    tx.sign([keypair], blockhash)  # One sign call
+    # Splice the blockhash into the prebuilt message once per batch
+    msg_head = msg_prefix + blockhash_bytes + msg_suffix
 
-    # Serialize
-    raw_tx = bytes(tx)
-    encoded_tx = base58.b58encode(raw_tx).decode("utf-8")
-    return encoded_tx
+    # crypto_sign returns signature + message, which is the wire format
+    # after the signature count (1); one C call per transaction
+    sign, b64encode, pack, sk = crypto_sign, base64.b64encode, pack_lamports, secret_key
+    return [
+        b64encode(b"\x01" + sign(msg_head + pack(first_lamports + k * NUM_WORKERS), sk))
+        for k in range(n)
+    ]
 
 # -----------------------------------------------
 # Blockhash Updater
 # -----------------------------------------------
-async def update_blockhash(session: aiohttp.ClientSession):
+async def fetch_blockhash(session: aiohttp.ClientSession, rpc_url: str):
     """
-    Continuously fetch the latest blockhash from one (or multiple) RPCs.
-    Updates the global `current_blockhash`.
+    Fetch the latest blockhash from one RPC as (lastValidBlockHeight, raw
+    bytes), or None on failure.
     """
-    global current_blockhash
-    while True:
-        rpc_url = random.choice(SOLANA_RPC_URLS)
-        try:
-            # Build a minimal JSON request with orjson
-            payload = {
-                "jsonrpc": "2.0",
-                "id": 1,
-                "method": "getLatestBlockhash",
-                "params": []
-            }
-            data_bytes = orjson.dumps(payload)
-            async with session.post(
-                    rpc_url,
-                    data=data_bytes,
-                    headers={"Content-Type": "application/json"},  # Important!
-                    timeout=3
-            ) as response:
-                resp_data = await response.read()
+    try:
+        async with session.post(
+                rpc_url,
+                data=BLOCKHASH_PAYLOAD,
+                headers=JSON_HEADERS,
+                timeout=3
+        ) as response:
+            resp_data = await response.read()
 
-                # DEBUG: Uncomment to see raw responses
-                # print(f"DEBUG: RPC response from {rpc_url}: {resp_data}")
+            # DEBUG: Uncomment to see raw responses
+            # print(f"DEBUG: RPC response from {rpc_url}: {resp_data}")
 
-                data = orjson.loads(resp_data)
-                blockhash_str = data["result"]["value"]["blockhash"]
-                new_hash = Hash.from_string(blockhash_str)
-                if new_hash != current_blockhash:
-                    current_blockhash = new_hash
-                    # DEBUG: Uncomment if you want to see blockhash updates
-                    # print(f"DEBUG: Updated blockhash to {current_blockhash}")
-        except Exception as e:
-            # DEBUG: Uncomment to see error details
-            # print(f"DEBUG: Error fetching blockhash from {rpc_url} -> {e}")
-            pass
+            value = orjson.loads(resp_data)["result"]["value"]
+            return value["lastValidBlockHeight"], bytes(Hash.from_string(value["blockhash"]))
+    except Exception as e:
+        # DEBUG: Uncomment to see error details
+        # print(f"DEBUG: Error fetching blockhash from {rpc_url} -> {e}")
+        return None
 
-        await asyncio.sleep(1)
+async def refresh_blockhash(session: aiohttp.ClientSession, rpc_url: str):
+    """
+    Fetch the blockhash from one RPC and publish it to the workers through
+    `shared_blockhash`, but only if it is strictly newer than the published
+    one, so a lagging RPC can never roll the workers back.
+    """
+    global latest_valid_height
+    fetched = await fetch_blockhash(session, rpc_url)
+    if fetched is not None and fetched[0] > latest_valid_height:
+        latest_valid_height, new_hash = fetched
+        shared_blockhash.raw = new_hash
+        # DEBUG: Uncomment if you want to see blockhash updates
+        # print(f"DEBUG: Updated blockhash to {Hash(new_hash)}")
+
+async def update_blockhash(sessions: dict):
+    """
+    Continuously refresh the blockhash every 200 ms, asking two RPCs at a
+    time (rotating through them). Each tick waits only for the first answer;
+    a slower fetch finishes in the background, keeping its connection, and
+    its RPC is skipped until then.
+    Runs in the main process only.
+    """
+    in_flight = {}  # RPC URL -> refresh task still running against it
+    while True:
+        # Two different RPCs per tick (just one if only one is configured)
+        for url in {next(rpc_cycle), next(rpc_cycle)}:
+            if url not in in_flight:
+                task = asyncio.create_task(refresh_blockhash(sessions[url], url))
+                task.add_done_callback(lambda _, url=url: in_flight.pop(url))
+                in_flight[url] = task
+
+        await asyncio.wait(in_flight.values(), return_when=asyncio.FIRST_COMPLETED)
+        await asyncio.sleep(0.2)
+
+async def follow_blockhash():
+    """
+    Pick up the blockhash the main process publishes in `shared_blockhash`.
+    Updates the global `current_blockhash`.
+    """
+    global current_blockhash
+    while True:
+        new_hash = shared_blockhash.raw
+        if new_hash != NO_BLOCKHASH and new_hash != current_blockhash:
+            current_blockhash = new_hash
+            blockhash_ready.set()
+        await asyncio.sleep(0.05)
 
 # -----------------------------------------------
 # Transaction Producer
 # -----------------------------------------------
-async def transaction_producer():
+async def transaction_producer(executor: concurrent.futures.Executor, worker_id: int):
     """
-    Continuously produce signed transactions (base58-encoded).
-    If queue is near capacity, wait briefly to avoid overfilling.
+    Continuously produce signed transactions (base64-encoded).
+    Blocks on `tx_slots` once this worker's share of QUEUE_MAXSIZE is waiting.
+    Workers interleave their lamports amounts (offset `worker_id`, stride
+    NUM_WORKERS), restarting from LAMPORTS for every new blockhash.
     """
     loop = asyncio.get_running_loop()
     while True:
-        while current_blockhash is None:
-            await asyncio.sleep(0.0005)
+        await blockhash_ready.wait()
 
-        old_hash = current_blockhash
+        old_hash_bytes = current_blockhash
+        next_lamports = LAMPORTS + worker_id
         # Produce until blockhash changes
-        while old_hash == current_blockhash:
-            if tx_queue.qsize() >= QUEUE_MAXSIZE * 0.8:
-                await asyncio.sleep(0.0005)
-                continue
-
+        while old_hash_bytes is current_blockhash:
             try:
-                # CPU-bound signing in threadpool
-                encoded_tx = await loop.run_in_executor(
-                    executor, create_signed_transaction, old_hash
+                # CPU-bound signing on the worker's signing thread
+                batch = await loop.run_in_executor(
+                    executor, create_signed_batch,
+                    old_hash_bytes, next_lamports, SIGN_BATCH_SIZE
                 )
-                await tx_queue.put(encoded_tx)
+                next_lamports += SIGN_BATCH_SIZE * NUM_WORKERS
+                for encoded_tx in batch:
+                    await tx_slots.acquire()
+                    tx_deque.append(encoded_tx)
+                    tx_ready.set()
+                counters[QUEUED] = len(tx_deque)
             except Exception:
                 continue
 
 # -----------------------------------------------
 # Transaction Sender
 # -----------------------------------------------
+def build_send_buffer(tx_len: int):
+    """
+    Lay out a reusable JSON-RPC batch request with SEND_BATCH_SIZE entries.
+    Every signed transaction encodes to the same `tx_len` bytes, so each
+    entry only needs its transaction bytes overwritten in place.
+    Returns the buffer and, per entry, (transaction offset, offset of the
+    "," that follows the entry).
+    """
+    buf = bytearray(b"[")
+    slots = []
+    for suffix in SEND_TX_SUFFIXES:
+        buf += SEND_TX_PREFIX
+        tx_start = len(buf)
+        buf += bytes(tx_len)
+        buf += suffix
+        slots.append((tx_start, len(buf)))
+        buf += b","
+    return buf, slots
+
 async def transaction_sender(session: aiohttp.ClientSession, rpc_url: str):
     """
-    Continuously fetch signed transactions from the queue and submit them.
-    Each sender task is pinned to a single RPC (round-robin assigned).
+    Continuously fetch signed transactions from the queue and submit them,
+    up to SEND_BATCH_SIZE per JSON-RPC batch request.
+    Each sender task is pinned to a single RPC (round-robin assigned) and
+    assembles its requests in its own reusable buffer.
     """
-    global total_success, error_count
+    buf = view = slots = None
     while True:
-        try:
-            encoded_tx = await tx_queue.get()
-        except Exception:
-            continue
+        while not tx_deque:
+            tx_ready.clear()
+            await tx_ready.wait()
+
+        if buf is None:
+            buf, slots = build_send_buffer(len(tx_deque[0]))
+            view = memoryview(buf)
 
-        payload = {
-            "jsonrpc": "2.0",
-            "id": 1,
-            "method": "sendTransaction",
-            "params": [encoded_tx]
-        }
-        data_bytes = orjson.dumps(payload)
+        batch_size = min(len(tx_deque), SEND_BATCH_SIZE)
+        for i in range(batch_size):
+            encoded_tx = tx_deque.popleft()
+            tx_start = slots[i][0]
+            buf[tx_start:tx_start + len(encoded_tx)] = encoded_tx
+            tx_slots.release()
+        counters[QUEUED] = len(tx_deque)
+
+        # Close the array after the last entry; the "," is restored below
+        end = slots[batch_size - 1][1]
+        buf[end] = ord("]")
 
         try:
             async with session.post(
                     rpc_url,
-                    data=data_bytes,
-                    headers={"Content-Type": "application/json"},  # Important!
+                    data=view[:end + 1],
+                    headers=JSON_HEADERS,
                     timeout=3
             ) as response:
                 resp_data = await response.read()
-                result = orjson.loads(resp_data)
+                # Fast path: an error-free batch needs no JSON parsing
+                if response.status == 200 and b'"error"' not in resp_data:
+                    counters[SUCCESS] += batch_size
+                    continue
+
+                results = orjson.loads(resp_data)
+                # A malformed batch is answered with a single error object
+                if isinstance(results, dict):
+                    results = [results]
 
-                if "error" in result:
-                    err_msg = result["error"].get("message", "").lower()
-                    if "blockhash" not in err_msg and "expired" not in err_msg:
-                        error_count += 1
-                else:
-                    total_success += 1
+                for result in results:
+                    if "error" in result:
+                        err_msg = result["error"].get("message", "").lower()
+                        if "blockhash" not in err_msg and "expired" not in err_msg:
+                            counters[ERRORS] += 1
+                    else:
+                        counters[SUCCESS] += 1
 
         except Exception:
-            error_count += 1
+            counters[ERRORS] += batch_size
+        finally:
+            buf[end] = ord(",")
 
 # -----------------------------------------------
 # Measurement / Stats Logger
 # -----------------------------------------------
-async def measuring_worker(interval=5):
+async def measuring_worker(stats: list, workers: list, interval=5):
     """
-    Prints throughput stats every `interval` seconds.
+    Prints throughput stats, summed over all worker processes,
+    every `interval` seconds.
     Minimal text to reduce overhead.
+    Returns as soon as any worker process has exited.
     """
-    global total_success, error_count
     prev_success = 0
     while True:
         await asyncio.sleep(interval)
-        current = total_success
+        for worker in workers:
+            if worker.exitcode is not None:
+                sys.stdout.buffer.write(
+                    b"Worker process %d exited with code %d, stopping\n"
+                    % (worker.pid, worker.exitcode)
+                )
+                sys.stdout.buffer.flush()
+                return
+
+        current = sum(worker_counters[SUCCESS] for worker_counters in stats)
+        errors = sum(worker_counters[ERRORS] for worker_counters in stats)
+        qsize = sum(worker_counters[QUEUED] for worker_counters in stats)
         delta = current - prev_success
         tps = delta / interval
-        qsize = tx_queue.qsize()
 
-        print(
-            f"[{interval}s] TPS={tps:.1f}, total_ok={current}, "
-            f"errors={error_count}, queue_size={qsize}"
+        sys.stdout.buffer.write(
+            b"[%ds] TPS=%.1f, total_ok=%d, errors=%d, queue_size=%d\n"
+            % (interval, tps, current, errors, qsize)
         )
+        sys.stdout.buffer.flush()
         prev_success = current
 
 # -----------------------------------------------
-# Main Execution
+# Worker Process
 # -----------------------------------------------
-async def main():
-    # Create one shared ClientSession with unlimited TCP connections
-    connector = aiohttp.TCPConnector(limit=0)
-    async with aiohttp.ClientSession(connector=connector) as session:
+async def open_sessions(stack: contextlib.AsyncExitStack, conns_per_url: dict) -> dict:
+    """
+    Open one ClientSession per RPC URL, each with its own keep-alive pool of
+    `conns_per_url[url]` connections; `stack` closes them on exit.
+    """
+    sessions = {}
+    for url, conns in conns_per_url.items():
+        connector = aiohttp.TCPConnector(
+            limit=conns,
+            limit_per_host=conns,
+            ttl_dns_cache=300,
+            enable_cleanup_closed=True
+        )
+        sessions[url] = await stack.enter_async_context(
+            aiohttp.ClientSession(connector=connector)
+        )
+    return sessions
+
+async def main_worker(worker_id: int, sender_ids: range):
+    """
+    Run the blockhash follower, one producer and the given slice of
+    sender tasks inside a single worker process.
+    """
+    global tx_ready, tx_slots, blockhash_ready
+    tx_ready = asyncio.Event()
+    # QUEUE_MAXSIZE is the total over all workers
+    tx_slots = asyncio.Semaphore(max(1, QUEUE_MAXSIZE // NUM_WORKERS))
+    blockhash_ready = asyncio.Event()
+
+    # Sign on one background thread; parallelism comes from the worker processes
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+
+    # One keep-alive connection per sender, sized from this worker's actual
+    # senders per URL; a worker's senders need not be spread evenly over them
+    senders_per_url = Counter(
+        SOLANA_RPC_URLS[i % len(SOLANA_RPC_URLS)] for i in sender_ids
+    )
+    async with contextlib.AsyncExitStack() as stack:
+        sessions = await open_sessions(stack, senders_per_url)
+
         # Start tasks
-        asyncio.create_task(update_blockhash(session))
-        asyncio.create_task(transaction_producer())
-        asyncio.create_task(measuring_worker(MEASUREMENT_INTERVAL))
+        asyncio.create_task(follow_blockhash())
+        asyncio.create_task(transaction_producer(executor, worker_id))
 
         # Round-robin assignment of RPC URLs for each sender
         sender_tasks = []
-        for i in range(NUM_SENDERS):
+        for i in sender_ids:
             url = SOLANA_RPC_URLS[i % len(SOLANA_RPC_URLS)]
             sender_tasks.append(
-                asyncio.create_task(transaction_sender(session, url))
+                asyncio.create_task(transaction_sender(sessions[url], url))
             )
 
         await asyncio.gather(*sender_tasks)
 
+def run_worker(worker_id: int, sender_ids: range, worker_counters, blockhash_array):
+    """
+    Entry point of a worker process: pin it to its own CPU (where the OS
+    supports it), set up signing and run its event loop until Ctrl-C.
+    """
+    global counters, shared_blockhash
+    counters = worker_counters
+    shared_blockhash = blockhash_array
+
+    if hasattr(os, "sched_setaffinity"):
+        cpus = sorted(os.sched_getaffinity(0))
+        os.sched_setaffinity(0, {cpus[worker_id % len(cpus)]})
+
+    init_signer()
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    try:
+        asyncio.run(main_worker(worker_id, sender_ids))
+    except KeyboardInterrupt:
+        pass  # The main process reports the shutdown
+
+# -----------------------------------------------
+# Main Execution
+# -----------------------------------------------
+async def main_loop(stats: list, workers: list):
+    """
+    Poll the blockhash once for all workers and print stats until a
+    worker process exits.
+    """
+    async with contextlib.AsyncExitStack() as stack:
+        # Room for a slower fetch still finishing while the next one starts
+        sessions = await open_sessions(stack, dict.fromkeys(SOLANA_RPC_URLS, 2))
+        asyncio.create_task(update_blockhash(sessions))
+        await measuring_worker(stats, workers, MEASUREMENT_INTERVAL)
+
+def main():
+    global shared_blockhash
+    # Spawn the workers; each takes every NUM_WORKERS-th sender, so the
+    # round-robin RPC assignment is the same as with a single process
+    ctx = multiprocessing.get_context("spawn")
+    shared_blockhash = ctx.Array("c", 32)  # Locked: written here, read by workers
+    stats = []
+    workers = []
+    for worker_id in range(NUM_WORKERS):
+        worker_counters = ctx.Array("Q", 3, lock=False)  # Single writer per array
+        stats.append(worker_counters)
+        sender_ids = range(worker_id, NUM_SENDERS, NUM_WORKERS)
+        worker = ctx.Process(
+            target=run_worker,
+            args=(worker_id, sender_ids, worker_counters, shared_blockhash),
+            daemon=True
+        )
+        worker.start()
+        workers.append(worker)
+
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    try:
+        asyncio.run(main_loop(stats, workers))
+    except KeyboardInterrupt:
+        sys.stdout.buffer.write(b"Interrupted, stopping\n")
+        sys.stdout.buffer.flush()
+    finally:
+        # Daemon workers would be killed on exit anyway; stop them explicitly
+        for worker in workers:
+            worker.terminate()
+        for worker in workers:
+            worker.join()
+
 if __name__ == "__main__":
-    asyncio.run(main())
+    main()